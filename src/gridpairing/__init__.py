@@ -1,4 +1,4 @@
 from .grid import Grid
-from .solvers import SolverNaive, SolverBellmanFord
+from .solvers import SolverNaive, SolverBellmanFord, SolverMatching
 
-__all__ = ["Grid", "SolverNaive", "SolverBellmanFord"]
\ No newline at end of file
+__all__ = ["Grid", "SolverNaive", "SolverBellmanFord", "SolverMatching"]
\ No newline at end of file
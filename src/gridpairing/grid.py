@@ -1,8 +1,52 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 """
 This is the grid module. It contains the Grid class and its associated methods.
 """
+import numpy as np
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # Numba is optional: without it the kernels run as plain Python
+    _HAS_NUMBA = False
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+# Color compatibility table: _COMPAT[c1, c2] is True if a cell of color c1 can be paired with a cell of color c2
+# (the black row and column are all False, so forbidden cells are excluded as well)
+_COMPAT = np.array([[1, 1, 1, 1, 0],
+                    [1, 1, 1, 0, 0],
+                    [1, 1, 1, 0, 0],
+                    [1, 0, 0, 1, 0],
+                    [0, 0, 0, 0, 0]], dtype=bool)
+
+@njit(cache=True)
+def _enumerate_valid_pairs(color, compat, n, m):
+    """
+    Enumerates the valid pairs of a grid of colors, cell by cell (row-major), the right neighbor
+    of each cell coming before the below one. Pairs are written in a preallocated array which is
+    truncated at the end.
+    """
+    pairs = np.empty((2 * n * m, 4), dtype=np.intp)
+    k = 0
+    for i in range(n):
+        for j in range(m):
+            c = color[i, j]
+            if j + 1 < m and compat[c, color[i, j + 1]]:
+                pairs[k, 0] = i
+                pairs[k, 1] = j
+                pairs[k, 2] = i
+                pairs[k, 3] = j + 1
+                k += 1
+            if i + 1 < n and compat[c, color[i + 1, j]]:
+                pairs[k, 0] = i
+                pairs[k, 1] = j
+                pairs[k, 2] = i + 1
+                pairs[k, 3] = j
+                k += 1
+    return pairs[:k]
 
 class Grid():
     """
@@ -14,18 +58,21 @@ class Grid():
         Number of lines in the grid
     m: int
         Number of columns in the grid
-    color: list[list[int]]
-        The color of each grid cell: value[i][j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
+    color: np.ndarray[uint8] of shape (n, m)
+        The color of each grid cell: color[i, j] is the color of the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
-    value: list[list[int]]
-        The value of each grid cell: value[i][j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
+    value: np.ndarray[int32] of shape (n, m)
+        The value of each grid cell: value[i, j] is the value in the cell (i, j), i.e., in the i-th line and j-th column. 
         Note: lines are numbered 0..n-1 and columns are numbered 0..m-1.
     colors_list: list[char]
-        The mapping between the value of self.color[i][j] and the corresponding color
+        The mapping between the value of self.color[i, j] and the corresponding color
+    forbidden_mask: np.ndarray[bool] of shape (n, m)
+        forbidden_mask[i, j] is True if the cell (i, j) is forbidden (i.e., black)
     """
-    
 
-    def __init__(self, n, m, color=None, value=[]):
+    __slots__ = ("n", "m", "color", "value", "colors_list", "forbidden_mask", "_pairs_cache")
+
+    def __init__(self, n, m, color=None, value=None):
         """
         Initializes the grid.
 
@@ -35,33 +82,40 @@ class Grid():
             Number of lines in the grid
         m: int
             Number of columns in the grid
-        color: list[list[int]]
+        color: list[list[int]] or np.ndarray
             The grid cells colors. Default is empty (then the grid is created with each cell having color 0, i.e., white).
-        value: list[list[int]]
+        value: list[list[int]] or np.ndarray
             The grid cells values. Default is empty (then the grid is created with each cell having value 1).
         
-        The object created has an attribute colors_list: list[char], which is the mapping between the value of self.color[i][j] and the corresponding color
+        Colors and values are stored as two contiguous 2D arrays (uint8 and int32) so that whole-grid predicates can be vectorized.
+        The object created has an attribute colors_list: list[char], which is the mapping between the value of self.color[i, j] and the corresponding color
         """
         self.n = n
         self.m = m
-        if not color:
-            color = [[0 for j in range(m)] for i in range(n)]            
-        self.color = color
-        if not value:
-            value = [[1 for j in range(m)] for i in range(n)]            
-        self.value = value
+        if color is None or len(color) == 0:
+            self.color = np.zeros((n, m), dtype=np.uint8)
+        else:
+            self.color = np.asarray(color, dtype=np.uint8)
+        if value is None or len(value) == 0:
+            self.value = np.ones((n, m), dtype=np.int32)
+        else:
+            self.value = np.asarray(value, dtype=np.int32)
         self.colors_list = ['w', 'r', 'b', 'g', 'k']
+        self.forbidden_mask = self.color == 4
+        self._pairs_cache = None
 
     def __str__(self): 
         """
         Prints the grid as text.
         """
+        n, colors_list = self.n, self.colors_list
+        color, value = self.color.tolist(), self.value.tolist()
         output = f"The grid is {self.n} x {self.m}. It has the following colors:\n"
-        for i in range(self.n): 
-            output += f"{[self.colors_list[self.color[i][j]] for j in range(self.m)]}\n"
+        for i in range(n): 
+            output += f"{[colors_list[c] for c in color[i]]}\n"
         output += f"and the following values:\n"
-        for i in range(self.n): 
-            output += f"{self.value[i]}\n"
+        for i in range(n): 
+            output += f"{value[i]}\n"
         return output
 
     def __repr__(self): 
@@ -70,22 +124,33 @@ class Grid():
         """
         return f"<grid.Grid: n={self.n}, m={self.m}>"
 
-    def plot(self, pairs=None): 
+    def plot(self, pairs=None, show_values=True): 
         """
         Plots a visual representation of the grid.
+        The cells are drawn as a single image and the pairs as a single line collection,
+        so that large grids stay fast to plot. The values can be hidden with show_values=False.
         """
+        # matplotlib is only imported when plotting, to keep the solvers light to import
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+        from matplotlib.colors import to_rgb
+
         fig, ax = plt.subplots()
         facecolors=["white","red","blue","green","black"]
-        for i in range(self.n):
-            for j in range(self.m):
-                facecolor = facecolors[self.color[i][j]]
-                ax.add_patch(patches.Rectangle((j, i), 1, 1, facecolor=facecolor))
-                ax.text(j + 0.5, i + 0.5, str(self.value[i][j]), ha='center', va='center',color = "white" if (facecolor == "black" or facecolor == "blue") else "black")
+        rgb = np.array([to_rgb(facecolor) for facecolor in facecolors])[self.color]
+        ax.imshow(rgb, extent=(0, self.m, self.n, 0), interpolation="nearest", aspect="auto")
+        if show_values:
+            n, m = self.n, self.m
+            color, value = self.color.tolist(), self.value.tolist()
+            for i in range(n):
+                for j in range(m):
+                    facecolor = facecolors[color[i][j]]
+                    ax.text(j + 0.5, i + 0.5, str(value[i][j]), ha='center', va='center',color = "white" if (facecolor == "black" or facecolor == "blue") else "black")
 
         # Draws the selected pairs if a solver's output was given
         if pairs:
-            for (x1, y1), (x2, y2) in pairs:
-                plt.plot([y1 + 0.5, y2 + 0.5], [x1 + 0.5, x2 + 0.5], color="yellow",linewidth=5)
+            segments = [[(y1 + 0.5, x1 + 0.5), (y2 + 0.5, x2 + 0.5)] for (x1, y1), (x2, y2) in pairs]
+            ax.add_collection(LineCollection(segments, colors="yellow", linewidths=5))
         ax.set_xlim(0, self.m)
         ax.set_ylim(0, self.n)
         plt.axis("off")
@@ -107,7 +172,7 @@ class Grid():
             bool
                 True if the cell is black (forbidden), False otherwise.
             """
-        return self.color[i][j] == 4
+        return self.color[i, j] == 4
     
     def non_adjacent(self,c1,c2):
         """
@@ -152,14 +217,7 @@ class Grid():
         bool
             True if the pairing is not allowed, False otherwise.
         """
-        color_rules = {
-        0: lambda c: False,  # White can pair with any non-black
-        1: lambda c: c > 2,   # Red can pair with red, blue, or white
-        2: lambda c: c > 2,   # Blue can pair with red, blue, or white
-        3: lambda c: c not in {0, 3},  # Green can only pair with green or white
-        4: lambda c: True    # Black is always forbidden
-    }
-        return color_rules[self.color[c1[0]][c1[1]]](self.color[c2[0]][c2[1]])
+        return not _COMPAT[self.color[c1], self.color[c2]]
     
     def test_pair(self,c1,c2):
         """
@@ -180,7 +238,38 @@ class Grid():
             bool
                 True if the pair is valid, False otherwise.
             """
-        return not(self.is_forbidden(c1[0],c1[1]) or self.is_forbidden(c2[0],c2[1]) or self.non_adjacent(c1,c2) or self.colors_forbidden(c1,c2))
+        # The adjacency test only needs integer arithmetic, so it runs first;
+        # the compatibility table then covers both the colors and the black cells
+        (i1, j1), (i2, j2) = c1, c2
+        if abs(i1 - i2) + abs(j1 - j2) != 1:
+            return False
+        return self.test_neighbor_pair(i1, j1, i2, j2)
+
+    def test_neighbor_pair(self, i1, j1, i2, j2):
+        """
+            Checks if two cells already known to be adjacent can be paired, i.e., if neither cell
+            is forbidden and their colors are compatible.
+
+            Parameters:
+            -----------
+            i1, j1: int
+                Coordinates of the first cell.
+            i2, j2: int
+                Coordinates of the second cell.
+
+            Returns:
+            --------
+            bool
+                True if the pair is valid, False otherwise.
+            """
+        color = self.color
+        c1 = color[i1, j1]
+        if c1 == 4:
+            return False
+        c2 = color[i2, j2]
+        if c2 == 4:
+            return False
+        return bool(_COMPAT[c1, c2])
 
     def cost(self, pair):
         """
@@ -196,25 +285,44 @@ class Grid():
         cost: int
             the cost of the pair defined as the absolute value of the difference between their values
         """
-        return abs(self.value[pair[0][0]][pair[0][1]]-self.value[pair[1][0]][pair[1][1]])
+        return abs(int(self.value[pair[0]]) - int(self.value[pair[1]]))
+
+
+    def all_pairs_array(self):
+        """
+        Returns all pairs of cells that can be taken together, as an array.
+        The pairs are enumerated by a kernel JIT-compiled with Numba if it is installed; otherwise the right and
+        below neighbors of every cell are tested at once with NumPy masks over the whole grid.
+        Pairs are ordered cell by cell (row-major), the right neighbor coming before the below one.
+        The array is computed once and cached on the grid (read-only), since colors do not change after loading.
 
+        Output: 
+        -----------
+        pairs: np.ndarray[intp] of shape (k, 4)
+            Each row (i1, j1, i2, j2) is a valid pair ((i1, j1), (i2, j2))
+        """
+        if self._pairs_cache is None and _HAS_NUMBA:
+            self._pairs_cache = _enumerate_valid_pairs(self.color, _COMPAT, self.n, self.m)
+            self._pairs_cache.setflags(write=False)
+        elif self._pairs_cache is None:
+            color = self.color
+            hi, hj = np.nonzero(_COMPAT[color[:, :-1], color[:, 1:]])
+            vi, vj = np.nonzero(_COMPAT[color[:-1, :], color[1:, :]])
+            pairs = np.concatenate((np.stack((hi, hj, hi, hj + 1), axis=1),
+                                    np.stack((vi, vj, vi + 1, vj), axis=1)))
+            order = np.argsort(np.concatenate((2 * (hi * self.m + hj), 2 * (vi * self.m + vj) + 1)), kind="stable")
+            self._pairs_cache = pairs[order]
+            self._pairs_cache.setflags(write=False)
+        return self._pairs_cache
 
     def all_pairs(self):
         """
         Returns a list of all pairs of cells that can be taken together. 
         Complexity: O(n * m) since there are n*m cells and we test only the adjacent cells (2 * n * m)
         Outputs a list of tuples of tuples [(c1, c2), (c1', c2'), ...] where each cell c1 etc. is itself a tuple (i, j)
+        Each pair appears exactly once since only the right and below neighbors of each cell are tested, so no deduplication is needed.
         """
-        pairs = []
-        for i in range(self.n):
-            for j in range(self.m):
-                # Tests the right and the below neighbors
-                if j + 1 < self.m and self.test_pair((i, j), (i, j + 1)):
-                    pairs.append(((i, j), (i, j + 1)))
-                if i + 1 < self.n and self.test_pair((i, j), (i + 1, j)):
-                    pairs.append(((i, j), (i + 1, j)))
-        # Ensures to return only unique pairs
-        return list(set(pairs))
+        return [((i1, j1), (i2, j2)) for i1, j1, i2, j2 in self.all_pairs_array().tolist()]
     
     @classmethod
     def grid_from_file(cls, file_name, read_values=True): 
@@ -238,26 +346,32 @@ class Grid():
         """
         with open(file_name, "r") as file:
             n, m = map(int, file.readline().split())
-            color = [[] for i_line in range(n)]
-            for i_line in range(n):
-                line_color = list(map(int, file.readline().split()))
-                if len(line_color) != m: 
-                    raise Exception("Invalid format")
-                for j in range(m):
-                    if line_color[j] not in range(5):
-                        raise Exception("Invalid color")
-                color[i_line] = line_color
-
-            if read_values:
-                value = [[] for i_line in range(n)]
-                for i_line in range(n):
-                    line_value = list(map(int, file.readline().split()))
-                    if len(line_value) != m: 
-                        raise Exception("Invalid format")
-                    value[i_line] = line_value
-            else:
-                value = []
-
-            grid = Grid(n, m, color, value)
-        return grid
+            lines = file.readlines()
 
+        # Missing or blank lines are rejected before parsing, since np.loadtxt skips
+        # blank lines (and warns when it gets no data at all)
+        if len(lines) < n or any(not line.split() for line in lines[:n]):
+            raise Exception("Invalid format")
+        try:
+            color = np.loadtxt(lines[:n], dtype=np.int64, ndmin=2)
+        except ValueError:
+            raise Exception("Invalid format")
+        if color.shape != (n, m):
+            raise Exception("Invalid format")
+        if ((color < 0) | (color > 4)).any():
+            raise Exception("Invalid color")
+
+        if read_values:
+            if len(lines) < 2 * n or any(not line.split() for line in lines[n:2 * n]):
+                raise Exception("Invalid format")
+            try:
+                value = np.loadtxt(lines[n:2 * n], dtype=np.int64, ndmin=2)
+            except ValueError:
+                raise Exception("Invalid format")
+            if value.shape != (n, m):
+                raise Exception("Invalid format")
+        else:
+            value = None
+
+        grid = Grid(n, m, color, value)
+        return grid
@@ -1,5 +1,9 @@
 from __future__ import annotations
-from .grid import Grid
+import numpy as np
+from .grid import Grid, njit, _HAS_NUMBA
+
+# Integer "infinite" distance: costs are integers, so distances stay in the int64 domain
+_INF = np.iinfo(np.int64).max
 
 class Solver:
     """
@@ -10,9 +14,11 @@ class Solver:
     grid: Grid
         The grid instance containing values and colors.
     pairs: list
-        A list of valid pairs, each being a tuple ((i1, j1), (i2, j2)).
+        The selected pairs, each being a tuple ((i1, j1), (i2, j2)). Empty until run() is called.
     """
 
+    __slots__ = ("grid", "pairs")
+
     def __init__(self, grid: Grid):
         """
         Initialize the solver with a grid.
@@ -23,7 +29,7 @@ class Solver:
             The input grid to solve.
         """
         self.grid = grid
-        self.pairs = self.grid.all_pairs()
+        self.pairs = []
 
     def score(self):
         """
@@ -34,14 +40,15 @@ class Solver:
         int
             The total score of the current solution.
         """
-        S = sum(self.grid.cost(pair) for pair in self.pairs)
-        used_cells = {cell for pair in self.pairs for cell in pair}
+        value = self.grid.value
+        i1, j1, i2, j2 = np.array(self.pairs, dtype=np.intp).reshape(-1, 4).T
+        S = int(np.abs(value[i1, j1] - value[i2, j2]).sum())
 
         # Adds the value of unused cells
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                if not self.grid.is_forbidden(i, j) and (i, j) not in used_cells:
-                    S += self.grid.value[i][j]
+        used = np.zeros((self.grid.n, self.grid.m), dtype=bool)
+        used[i1, j1] = True
+        used[i2, j2] = True
+        S += int(value[~used & ~self.grid.forbidden_mask].sum())
 
         return S
 
@@ -53,6 +60,8 @@ class SolverNaive(Solver):
     Time Complexity: O(n * m log(n * m)) due to sorting.
     """
 
+    __slots__ = ()
+
     def run(self):
         """
         Executes a naive solving strategy.
@@ -67,50 +76,151 @@ class SolverNaive(Solver):
         int
             The total score of the selected pairs.
         """
-        self.pairs = self.grid.all_pairs()
-        self.pairs.sort(key=lambda x: self.grid.cost(x))
-        used_cells = set()
+        pairs = self.grid.all_pairs_array()
+        value = self.grid.value
+        costs = np.abs(value[pairs[:, 0], pairs[:, 1]] - value[pairs[:, 2], pairs[:, 3]])
+        order = np.argsort(costs, kind="stable")
+        # Flat row-major bitmap of the cells already used: the cell (i, j) is used[i * m + j]
+        m = self.grid.m
+        used = bytearray(self.grid.n * m)
         selected_pairs = []
 
-        for pair in self.pairs:
-            if pair[0] not in used_cells and pair[1] not in used_cells:
-                used_cells.update(pair)
-                selected_pairs.append(pair)
+        for i1, j1, i2, j2 in pairs[order].tolist():
+            k1, k2 = i1 * m + j1, i2 * m + j2
+            if not used[k1] and not used[k2]:
+                used[k1] = used[k2] = 1
+                selected_pairs.append(((i1, j1), (i2, j2)))
 
         self.pairs = selected_pairs
         return self.score()
 
 
+@njit(cache=True)
+def _spfa(head, rhead, reverse_residual, nxt, to, cap, cost, flow, source, n_nodes, dist, pred, queue, in_queue):
+    """
+    Queue-based Bellman-Ford (SPFA) on the residual graph stored in the CSR arrays of a Graph.
+    Nodes are scanned in FIFO order: the order decides which of several equally cheap paths
+    is found, hence which optimal flow is returned, so it must not be changed lightly
+    (e.g. with the Small Label First heuristic), since it changes the scores.
+    The reverse edges leaving a node are only scanned when one of them has a positive
+    residual capacity, i.e. when flow goes through the matching principal edge.
+    Compiled with Numba when it is available; otherwise it runs as plain Python on lists,
+    which are much faster than NumPy arrays to index one element at a time.
+
+    The results are written in the buffers given by the caller, of size n_nodes:
+    dist (initialized to _INF) receives the distance of each node from the source,
+    pred (initialized to -1) the edge used to reach it, and queue and in_queue
+    (initialized to False) are used as work space.
+    """
+    dist[source] = 0
+
+    # Ring buffer queue: a node is at most once in the queue, so n_nodes slots are enough
+    q_head = 0
+    q_size = 1
+    queue[0] = source
+    in_queue[source] = True
+
+    while q_size > 0:
+        u = queue[q_head]
+        q_head = (q_head + 1) % n_nodes
+        q_size -= 1
+        in_queue[u] = False
+
+        # Goes through the principal edges leaving u, then through its reverse edges if needed
+        for k in range(2):
+            if k == 0:
+                e = head[u]
+            elif reverse_residual[u] > 0:
+                e = rhead[u]
+            else:
+                break
+            while e != -1:
+                if cap[e] > flow[e]:
+                    v = to[e]
+                    new_cost = dist[u] + cost[e]
+                    if new_cost < dist[v]:
+                        dist[v] = new_cost
+                        pred[v] = e
+                        if not in_queue[v]:
+                            queue[(q_head + q_size) % n_nodes] = v
+                            q_size += 1
+                            in_queue[v] = True
+                e = nxt[e]
+
+
+
 class Graph:
     """
     A graph implementation for min-cost flow problems.
     
     This class represents a directed graph with capacities and costs
     on edges, designed for min-cost flow algorithms.
+    Nodes are integers 0..n_nodes-1 and edges are stored in flat parallel
+    arrays (linked-list CSR): the principal edges leaving u are head[u],
+    nxt[head[u]], ... until -1, in the order they were added. Each principal
+    edge e (even index) is stored next to its reverse edge e ^ 1 (odd index),
+    and the reverse edges leaving u are chained the same way from rhead[u].
     
     Attributes:
     -----------
-    capacity: dict
-        Edge capacity mapping {u: {v: cap}}.
-    cost: dict
-        Edge cost mapping {u: {v: cost}}.
-    flow: dict
-        Current flow mapping {u: {v: flow}}.
-    neigh: dict
-        Set of neighbors for each node {u: {v1, v2, ...}}.
-    adj_list: dict
-        Adjacency list for faster traversal {u: [v1, v2, ...]}.
+    n_nodes: int
+        Number of nodes in the graph.
+    n_edges: int
+        Number of edges stored (reverse edges included).
+    head, rhead: np.ndarray[int32]
+        Index of the first principal (resp. reverse) edge leaving each node, -1 if none.
+    tail, rtail: np.ndarray[int32]
+        Index of the last principal (resp. reverse) edge leaving each node, -1 if none.
+    reverse_residual: np.ndarray[int32]
+        Number of reverse edges leaving each node with a positive residual capacity.
+    nxt: np.ndarray[int32]
+        Index of the next edge leaving the same node, -1 if none.
+    to: np.ndarray[int32]
+        Target node of each edge.
+    cap: np.ndarray[int32]
+        Capacity of each edge.
+    cost: np.ndarray[int32]
+        Cost of each edge.
+    flow: np.ndarray[int32]
+        Current flow on each edge.
     """
 
-    def __init__(self):
+    __slots__ = ("n_nodes", "n_edges", "head", "tail", "rhead", "rtail", "reverse_residual",
+                 "nxt", "to", "cap", "cost", "flow")
+
+    def __init__(self, n_nodes, max_edges=16):
         """
         Initialize an empty graph for min-cost flow.
+
+        Parameters:
+        -----------
+        n_nodes: int
+            Number of nodes in the graph
+        max_edges: int
+            Initial edge storage (reverse edges included), grown when needed
+        """
+        self.n_nodes = n_nodes
+        self.n_edges = 0
+        self.head = np.full(n_nodes, -1, dtype=np.int32)
+        self.tail = np.full(n_nodes, -1, dtype=np.int32)
+        self.rhead = np.full(n_nodes, -1, dtype=np.int32)
+        self.rtail = np.full(n_nodes, -1, dtype=np.int32)
+        self.reverse_residual = np.zeros(n_nodes, dtype=np.int32)
+        self.nxt = np.empty(max_edges, dtype=np.int32)
+        self.to = np.empty(max_edges, dtype=np.int32)
+        self.cap = np.empty(max_edges, dtype=np.int32)
+        self.cost = np.empty(max_edges, dtype=np.int32)
+        self.flow = np.empty(max_edges, dtype=np.int32)
+
+    def _grow(self):
         """
-        self.capacity = {}
-        self.cost = {}
-        self.flow = {}
-        self.neigh = {}
-        self.adj_list = {}
+        Double the edge storage of the graph.
+        """
+        size = max(2 * len(self.to), 2)
+        for name in ("nxt", "to", "cap", "cost", "flow"):
+            array = np.empty(size, dtype=np.int32)
+            array[:self.n_edges] = getattr(self, name)[:self.n_edges]
+            setattr(self, name, array)
 
     def add_edge(self, u, v, cap, cost):
         """
@@ -118,86 +228,85 @@ class Graph:
         
         Parameters:
         -----------
-        u: object
+        u: int
             Source node
-        v: object
+        v: int
             Target node
         cap: int
             Edge capacity
         cost: int
             Edge cost
         """
-        for node in [u, v]:
-            if node not in self.capacity:
-                self.capacity[node] = {}
-                self.cost[node] = {}
-                self.flow[node] = {}
-                self.neigh[node] = set()
-                self.adj_list[node] = []
+        if self.n_edges + 2 > len(self.to):
+            self._grow()
 
         # Principal edge
-        self.capacity[u][v] = cap
-        self.cost[u][v] = cost
-        self.flow[u][v] = 0
-        self.neigh[u].add(v)
-        self.adj_list[u].append(v)
+        e = self.n_edges
+        self.to[e], self.cap[e], self.cost[e], self.flow[e] = v, cap, cost, 0
+        self._link(u, e)
 
         # Reciprocal edge
-        self.capacity[v][u] = 0
-        self.cost[v][u] = -cost
-        self.flow[v][u] = 0
-        self.neigh[v].add(u)
-        self.adj_list[v].append(u)
+        self.to[e + 1], self.cap[e + 1], self.cost[e + 1], self.flow[e + 1] = u, 0, -cost, 0
+        self._link(v, e + 1)
+
+        self.n_edges += 2
+
+    def reset_flows(self):
+        """
+        Set the flow of every edge back to 0, keeping the graph structure.
+        """
+        self.flow[:self.n_edges] = 0
+        self.reverse_residual[:] = 0
+
+    def _link(self, u, e):
+        """
+        Append the edge e at the end of the list of principal or reverse edges leaving u.
+        """
+        head, tail = (self.rhead, self.rtail) if e & 1 else (self.head, self.tail)
+        self.nxt[e] = -1
+        if tail[u] == -1:
+            head[u] = e
+        else:
+            self.nxt[tail[u]] = e
+        tail[u] = e
 
     def bellman_ford(self, source, sink):
         """
         Runs a Bellman-Ford algorithm to find shortest paths.
         
-        Uses a version optimized to end early when a path to the sink
-        is found and uses a queue-based approach for performance.
+        Uses a queue-based approach (SPFA) for performance.
         
         Parameters:
         -----------
-        source: object
+        source: int
             Source node
-        sink: object
+        sink: int
             Sink node
             
         Returns:
         --------
         tuple
-            (distances, predecessors) where distances is a dict mapping
-            nodes to their shortest distance from source, and predecessors
-            is a dict mapping nodes to their predecessor in the shortest path.
+            (distances, predecessors) where distances maps nodes to their shortest
+            distance from source (_INF if unreachable), and predecessors maps nodes
+            to the edge used to reach them (-1 if none). Both are arrays, or lists
+            when Numba is not available.
         """
-        INF = float("inf")
-        dist = {node: INF for node in self.capacity}
-        pred = {node: None for node in self.capacity}
-        dist[source] = 0
-        
-        # Queue initialization
-        queue = [source]
-        in_queue = {node: (node == source) for node in self.capacity}
-                
-        while queue:
-            u = queue.pop(0)
-            in_queue[u] = False
-            
-            # Uses an adjacency list to go through the neighbors quicker
-            for v in self.adj_list[u]:
-                if self.capacity[u][v] > self.flow[u][v]:
-                    new_cost = dist[u] + self.cost[u][v]
-                    if new_cost < dist[v]:
-                        dist[v] = new_cost
-                        pred[v] = u
-                        if not in_queue[v]:
-                            queue.append(v)
-                            in_queue[v] = True
-            
-            # Stops search if sink is reached/if queue is empty
-            if not queue and dist[sink] < INF:
-                return dist, pred
-                
+        n_nodes, n_edges = self.n_nodes, self.n_edges
+        graph = (self.head, self.rhead, self.reverse_residual, self.nxt[:n_edges], self.to[:n_edges],
+                 self.cap[:n_edges], self.cost[:n_edges], self.flow[:n_edges])
+        if _HAS_NUMBA:
+            dist = np.full(n_nodes, _INF, dtype=np.int64)
+            pred = np.full(n_nodes, -1, dtype=np.int32)
+            queue = np.empty(n_nodes, dtype=np.int32)
+            in_queue = np.zeros(n_nodes, dtype=np.bool_)
+        else:
+            # The plain Python kernel runs on lists
+            graph = tuple(array.tolist() for array in graph)
+            dist = [int(_INF)] * n_nodes
+            pred = [-1] * n_nodes
+            queue = [0] * n_nodes
+            in_queue = [False] * n_nodes
+        _spfa(*graph, source, n_nodes, dist, pred, queue, in_queue)
         return dist, pred
 
     def min_cost_flow(self, source, sink):
@@ -209,9 +318,9 @@ class Graph:
         
         Parameters:
         -----------
-        source: object
+        source: int
             Source node
-        sink: object
+        sink: int
             Sink node
             
         Returns:
@@ -225,38 +334,42 @@ class Graph:
 
         while True:
             dist, pred = self.bellman_ford(source, sink)
-            if dist[sink] == float("inf"):
+            if dist[sink] == _INF:
                 break  # No more augmenting paths
 
             # Calculates augmenting path
             path = []
-            flow = float("inf")
+            flow = _INF
             v = sink
             while v != source:
-                u = pred[v]
-                if u is None:
+                e = pred[v]
+                if e == -1:
                     flow = 0
                     break
-                path.append((u, v))
-                flow = min(flow, self.capacity[u][v] - self.flow[u][v])
-                v = u
+                path.append(int(e))
+                flow = min(flow, int(self.cap[e] - self.flow[e]))
+                v = int(self.to[e ^ 1])
 
             if flow == 0:
                 break
 
             # Changes flow along the way
-            for u, v in path:
-                self.flow[u][v] += flow
-                self.flow[v][u] -= flow
-                total_cost += self.cost[u][v] * flow
+            for e in path:
+                # The reverse edge of the principal edge f has a residual capacity iff f carries flow
+                f = e & ~1
+                had_flow = self.flow[f] > 0
+                self.flow[e] += flow
+                self.flow[e ^ 1] -= flow
+                total_cost += int(self.cost[e]) * flow
+                if (self.flow[f] > 0) != had_flow:
+                    self.reverse_residual[self.to[f]] += -1 if had_flow else 1
 
         # Gives all the positive-flow pairs
-        for u in self.capacity:
-            if u == source or u == sink:
-                continue
-            for v in self.adj_list[u]:
-                if v != source and v != sink and self.flow[u][v] == 1:
-                    pairs.append((u, v))
+        to, flow = self.to[:self.n_edges], self.flow[:self.n_edges]
+        for e in np.flatnonzero(flow == 1).tolist():
+            u, v = int(to[e ^ 1]), int(to[e])
+            if u != source and v != sink:
+                pairs.append((u, v))
 
         return total_cost, pairs
 
@@ -275,17 +388,15 @@ class SolverBellmanFord(Solver):
     pairs: list
         Selected pairs in the solution.
     graph: Graph
-        The flow network used for min-cost flow.
-    source: str
-        Source node identifier.
-    sink: str
-        Sink node identifier.
-    cost_cache: dict
-        Cache for pair costs.
-    forbidden_cache: dict
-        Cache for forbidden cells.
+        The flow network used for min-cost flow. The cell (i, j) is the node i * m + j.
+    source: int
+        Source node identifier (n * m).
+    sink: int
+        Sink node identifier (n * m + 1).
     """
 
+    __slots__ = ("graph", "source", "sink")
+
     def __init__(self, grid):
         """
         Initialize the Bellman-Ford solver with a grid.
@@ -296,12 +407,9 @@ class SolverBellmanFord(Solver):
             The input grid to solve.
         """
         super().__init__(grid)
-        self.pairs = []
-        self.graph = Graph()
-        self.source = "S"
-        self.sink = "T"
-        self.cost_cache = {}
-        self.forbidden_cache = {}
+        self.source = grid.n * grid.m
+        self.sink = self.source + 1
+        self.graph = Graph(self.sink + 1)
 
     def build_graph(self):
         """
@@ -311,96 +419,38 @@ class SolverBellmanFord(Solver):
         - Even cells connect to the source
         - Odd cells connect to the sink
         - Valid pairs form edges between even and odd cells
+        Only the cells belonging to at least one valid pair are added,
+        since the other ones can never carry flow.
         """
-        valid_cells = []
-        even_cells = []
-        odd_cells = []
-        
-        # Separates cells between two categories: i + j odd or even
-        for i in range(self.grid.n):
-            for j in range(self.grid.m):
-                if self.is_forbidden_cached(i, j):
-                    continue
-                    
-                cell = (i, j)
-                valid_cells.append(cell)
-                
-                if (i + j) % 2 == 0:
-                    even_cells.append(cell)
-                else:
-                    odd_cells.append(cell)
-        
-        for cell in even_cells:
-            self.graph.add_edge(self.source, cell, 1, 0) # Adds an edge between source and even cells
-            self.add_edges_from(cell) # Adds edges between even and odd cells
-            
-        for cell in odd_cells:
-            self.graph.add_edge(cell, self.sink, 1, 0) # Adds an edge between odd cells and sink
-
-    # Uses cache for memorizing forbidden cells to reduce compute
+        m = self.grid.m
+        value = self.grid.value
+        pairs = self.grid.all_pairs_array()
+
+        # Orients each valid pair from its even cell (i + j even) to its odd cell
+        even_first = ((pairs[:, 0] + pairs[:, 1]) % 2 == 0)[:, None]
+        even = np.where(even_first, pairs[:, :2], pairs[:, 2:])
+        odd = np.where(even_first, pairs[:, 2:], pairs[:, :2])
+        even_nodes = even[:, 0] * m + even[:, 1]
+        odd_nodes = odd[:, 0] * m + odd[:, 1]
+        costs = np.abs(value[even[:, 0], even[:, 1]] - value[odd[:, 0], odd[:, 1]])
+
+        # Even cells in row-major order, each one's neighbors to the right, below, left then above
+        direction = (odd[:, 0] - even[:, 0] == 1) + 2 * (odd[:, 1] - even[:, 1] == -1) + 3 * (odd[:, 0] - even[:, 0] == -1)
+        order = np.lexsort((direction, even_nodes))
+
+        previous = -1
+        for u, v, cost in zip(even_nodes[order].tolist(), odd_nodes[order].tolist(), costs[order].tolist()):
+            if u != previous:
+                self.graph.add_edge(self.source, u, 1, 0) # Adds an edge between source and even cells
+                previous = u
+            self.graph.add_edge(u, v, 1, cost) # Adds edges between even and odd cells
+
+        for v in np.unique(odd_nodes).tolist():
+            self.graph.add_edge(v, self.sink, 1, 0) # Adds an edge between odd cells and sink
 
-    def is_forbidden_cached(self, i, j):
-        """
-        Check if a cell is forbidden, using cache for efficiency.
-        
-        Parameters:
-        -----------
-        i: int
-            Row index
-        j: int
-            Column index
-            
-        Returns:
-        --------
-        bool
-            True if the cell is forbidden, False otherwise
-        """
-        if (i, j) not in self.forbidden_cache:
-            self.forbidden_cache[(i, j)] = self.grid.is_forbidden(i, j)
-        return self.forbidden_cache[(i, j)]
-
-    def add_edges_from(self, cell):
-        """
-        Add edges from a cell to its valid neighbors.
-        
-        Parameters:
-        -----------
-        cell: tuple
-            The (i, j) coordinates of the cell
-        """
-        i, j = cell
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        for di, dj in directions:
-            ni, nj = i + di, j + dj
-            if 0 <= ni < self.grid.n and 0 <= nj < self.grid.m:
-                neighbor = (ni, nj)
-                if not self.is_forbidden_cached(ni, nj) and self.grid.test_pair(cell, neighbor):
-                    cost = self.get_cost_cached((cell, neighbor))
-                    self.graph.add_edge(cell, neighbor, 1, cost)
-
-
-    # Uses cache for memorizing costs to reduce compute
-    def get_cost_cached(self, pair):
-        """
-        Get the cost of a pair, using cache for efficiency.
-        
-        Parameters:
-        -----------
-        pair: tuple
-            A ((i1, j1), (i2, j2)) pair
-            
-        Returns:
-        --------
-        int
-            The cost of the pair
-        """
-        if pair not in self.cost_cache:
-            self.cost_cache[pair] = self.grid.cost(pair)
-        return self.cost_cache[pair]
-   
     def score(self):
         """
-        Compute the total score using the base implementation with caching.
+        Compute the total score using the base implementation.
         
         Returns:
         --------
@@ -418,12 +468,81 @@ class SolverBellmanFord(Solver):
         int
             The total score of the selected pairs
         """
-        # Reset graph & caches
-        self.graph = Graph()
-        self.cost_cache.clear()
-        self.forbidden_cache.clear()
         self.pairs = []
 
-        self.build_graph()
-        _, self.pairs = self.graph.min_cost_flow(self.source, self.sink)
-        return self.score()
\ No newline at end of file
+        # Nothing to solve if no pair can be formed
+        if len(self.grid.all_pairs_array()) == 0:
+            return self.score()
+
+        # The graph structure only depends on the grid: it is built on the first run,
+        # later runs only reset the flows
+        if self.graph.n_edges == 0:
+            self.build_graph()
+        else:
+            self.graph.reset_flows()
+        _, node_pairs = self.graph.min_cost_flow(self.source, self.sink)
+        self.pairs = [(divmod(u, self.grid.m), divmod(v, self.grid.m)) for u, v in node_pairs]
+        return self.score()
+
+class SolverMatching(Solver):
+    """
+    Grid solver delegating the min-cost matching to SciPy.
+
+    Solves the same problem as SolverBellmanFord (maximum number of pairs,
+    then minimum total cost) with scipy.sparse.csgraph.min_weight_full_bipartite_matching,
+    which runs in compiled code. Requires scipy.
+
+    Only the number of pairs and their total cost are guaranteed to match SolverBellmanFord:
+    when several sets of pairs are optimal, the two solvers may pick different ones, leaving
+    different cells unpaired, so their scores may differ.
+    """
+
+    __slots__ = ()
+
+    def run(self):
+        """
+        Run the SciPy matching solver to find optimal pairing.
+
+        Even cells are the rows and odd cells the columns of a sparse cost matrix.
+        Each row also gets its own dummy column, so that a full matching always exists.
+
+        Returns:
+        --------
+        int
+            The total score of the selected pairs
+        """
+        # scipy is only imported when this solver is used
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+
+        self.pairs = []
+        pairs = self.grid.all_pairs_array()
+        if len(pairs) == 0:
+            return self.score()
+
+        # Orients each pair from its even cell to its odd cell
+        m = self.grid.m
+        even_first = ((pairs[:, 0] + pairs[:, 1]) % 2 == 0)[:, None]
+        even = np.where(even_first, pairs[:, :2], pairs[:, 2:])
+        odd = np.where(even_first, pairs[:, 2:], pairs[:, :2])
+        value = self.grid.value
+        costs = np.abs(value[even[:, 0], even[:, 1]] - value[odd[:, 0], odd[:, 1]]).astype(np.int64)
+
+        row_nodes, rows = np.unique(even[:, 0] * m + even[:, 1], return_inverse=True)
+        col_nodes, cols = np.unique(odd[:, 0] * m + odd[:, 1], return_inverse=True)
+        n_rows, n_cols = len(row_nodes), len(col_nodes)
+
+        # Zero weights would be read as missing edges, so real edges weigh cost + 1.
+        # A dummy edge weighs more than any set of real edges: the matching first
+        # maximizes the number of pairs, then minimizes their total cost.
+        dummy = int((costs + 1).sum()) + 1
+        data = np.concatenate((costs + 1, np.full(n_rows, dummy, dtype=np.int64)))
+        row_ind = np.concatenate((rows, np.arange(n_rows)))
+        col_ind = np.concatenate((cols, n_cols + np.arange(n_rows)))
+        matrix = coo_matrix((data, (row_ind, col_ind)), shape=(n_rows, n_cols + n_rows)).tocsr()
+
+        row_ind, col_ind = min_weight_full_bipartite_matching(matrix)
+        matched = col_ind < n_cols
+        for u, v in zip(row_nodes[row_ind[matched]].tolist(), col_nodes[col_ind[matched]].tolist()):
+            self.pairs.append((divmod(u, m), divmod(v, m)))
+        return self.score()
@@ -1,4 +1,7 @@
 import sys
+from functools import lru_cache
+
+import numpy as np
 import pygame
 from pygame import gfxdraw
 
@@ -23,6 +26,7 @@ MARGIN = 3
 BUTTON_HEIGHT = 40
 SIDEBAR_WIDTH = 200
 ANIMATION_SPEED = 10  # Animation speed
+IDLE_TIMEOUT = 200  # Maximum time (ms) spent waiting for an event when nothing is animated
 
 # Modern color palette
 COLOR_MAP = {
@@ -54,6 +58,12 @@ solver = SolverBellmanFord(grid)
 WIDTH = grid.m * (CELL_SIZE + MARGIN) + MARGIN + SIDEBAR_WIDTH
 HEIGHT = max(grid.n * (CELL_SIZE + MARGIN) + MARGIN + BUTTON_HEIGHT * 3, 500)
 
+# Pixel coordinates of the top/left side and of the center of each row/column of cells
+ROW_PIX = [i * (CELL_SIZE + MARGIN) + MARGIN for i in range(grid.n)]
+COL_PIX = [j * (CELL_SIZE + MARGIN) + MARGIN for j in range(grid.m)]
+ROW_CENTER = [y + CELL_SIZE // 2 for y in ROW_PIX]
+COL_CENTER = [x + CELL_SIZE // 2 for x in COL_PIX]
+
 # Create window
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Interactive Grid (ENSAE Project 2025)")
@@ -63,20 +73,63 @@ pygame.display.set_icon(icon)
 
 # State variables
 selected_cells = []
-user_pairs = []
+user_pairs = []  # Pair records {"cells": (cell1, cell2), "cost": cost, "progress": line animation progress}
 hovering_cell = None
-animation_progress = {}  # For line animations
+mouse_cell = None  # Cell under the mouse at the last motion event (possibly outside the grid)
+hovered_button = None  # Index of the button under the mouse
 buttons = []
 show_solution = False
-solution_pairs = []
+solution_pairs = []  # Pair records, as user_pairs (only while the solution is shown)
 show_help = False
 last_score = 0
 score_animation = {"target": 0, "current": 0}
 best_score = None  # To store the best possible score
+pairs_version = 0  # Incremented each time user_pairs changes
+score_cache = {"version": None, "value": 0}  # Score of user_pairs at a given version
+active_animations = 0  # Number of pair lines whose animation is not over
+line_layers = {}  # Layer on which the finished lines of each group of pairs are drawn
+
+# Rendering state: frames are only drawn when something changed, and only the
+# dirty parts of the window are pushed to the display
+needs_redraw = True
+dirty_rects = [screen.get_rect()]
+
+# Grid area and sidebar
+GRID_RECT = pygame.Rect(0, 0, grid.m * (CELL_SIZE + MARGIN) + MARGIN, grid.n * (CELL_SIZE + MARGIN) + MARGIN)
+SIDEBAR_RECT = pygame.Rect(grid.m * (CELL_SIZE + MARGIN) + MARGIN, 0, SIDEBAR_WIDTH, HEIGHT)
+
+def mark_dirty(rect=None):
+    """Request a redraw, pushing rect (the whole window by default) to the display."""
+    global needs_redraw
+    needs_redraw = True
+    dirty_rects.append(pygame.Rect(rect) if rect is not None else screen.get_rect())
+
+def cell_rect(i, j):
+    """Rectangle covered by the cell (i, j) on screen."""
+    return pygame.Rect(COL_PIX[j], ROW_PIX[i], CELL_SIZE, CELL_SIZE)
+
+def new_pair(cell1, cell2):
+    """Record of a pair, with its cost (fixed once the pair exists), whose line animation has not started yet."""
+    return {"cells": (cell1, cell2), "cost": grid.cost((cell1, cell2)), "progress": 0.0}
+
+def animation_in_progress():
+    """Whether a pair line or the score is still animating."""
+    return (active_animations > 0
+            or score_animation["current"] != score_animation["target"])
+
+def new_surface(width, height, alpha=True):
+    """
+    Create a surface already converted to the pixel format of the display, so that
+    blitting it never requires a conversion. Surfaces with alpha=True have per-pixel
+    alpha and start fully transparent.
+    """
+    if alpha:
+        return pygame.Surface((width, height), pygame.SRCALPHA).convert_alpha()
+    return pygame.Surface((width, height)).convert()
 
 # Function to draw a rounded rectangle
-def draw_rounded_rect(surface, rect, color, corner_radius):
-    """Draw a rectangle with rounded corners."""
+def draw_rounded_rect_primitives(surface, rect, color, corner_radius):
+    """Draw a rectangle with rounded corners, primitive by primitive."""
     if corner_radius < 0:
         corner_radius = 0
     
@@ -103,6 +156,24 @@ def draw_rounded_rect(surface, rect, color, corner_radius):
     pygame.draw.rect(surface, color, (x + corner_radius, y, width - 2 * corner_radius, height))
     pygame.draw.rect(surface, color, (x, y + corner_radius, width, height - 2 * corner_radius))
 
+@lru_cache(maxsize=64)
+def get_rounded_rect_stamp(width, height, color, corner_radius):
+    """Render a rounded rectangle once on a transparent surface, reused by draw_rounded_rect."""
+    stamp = new_surface(width, height)
+    stamp.fill((*color[:3], 0))
+    draw_rounded_rect_primitives(stamp, pygame.Rect(0, 0, width, height), color, corner_radius)
+    return stamp
+
+def draw_rounded_rect(surface, rect, color, corner_radius):
+    """Draw a rectangle with rounded corners by blitting its cached stamp."""
+    rect = pygame.Rect(rect)
+    surface.blit(get_rounded_rect_stamp(rect.width, rect.height, tuple(color), corner_radius), rect.topleft)
+
+@lru_cache(maxsize=256)
+def render_cached(font, text, color):
+    """Render a text once and reuse the surface, since most texts are identical from one frame to the next."""
+    return font.render(text, True, color).convert_alpha()
+
 # Button class
 class Button:
     def __init__(self, rect, text, action, color=BUTTON_COLOR, hover_color=BUTTON_HOVER):
@@ -125,12 +196,16 @@ class Button:
             draw_rounded_rect(screen, shadow_rect, (20, 20, 20, 100), 8)
         
         # Draw button text
-        text_surf = FONT.render(self.text, True, TEXT_COLOR)
+        text_surf = render_cached(FONT, self.text, TEXT_COLOR)
         text_rect = text_surf.get_rect(center=self.rect.center)
         screen.blit(text_surf, text_rect)
     
     def check_hover(self, pos):
-        self.is_hovered = self.rect.collidepoint(pos)
+        is_hovered = bool(self.rect.collidepoint(pos))
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            # The shadow is drawn 2 pixels below the button
+            mark_dirty(self.rect.union(self.rect.move(0, 2)))
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and self.is_hovered:
@@ -178,89 +253,136 @@ def create_buttons():
 
 # Button actions
 def auto_solve():
-    global show_solution, solution_pairs, selected_cells, best_score
+    global show_solution, solution_pairs, selected_cells, best_score, active_animations
     selected_cells = []
     
-    # Solve in the background
-    solver.run()
-    solution_pairs = solver.pairs.copy()
-    
-    # Compute the best possible score
-    best_score = calculate_score(solution_pairs)
+    # Solve in the background: the solver returns the best possible score
+    best_score = solver.run()
     
     # Toggle solution display
     show_solution = not show_solution
+    solution_pairs = [new_pair(*pair) for pair in solver.pairs] if show_solution else []
     
     # Reset animations
-    global animation_progress
-    animation_progress = {}
+    for pair in user_pairs:
+        pair["progress"] = 0.0
+    active_animations = len(user_pairs) + len(solution_pairs)
+    line_layers.clear()
     
     # Update button text
     buttons[0].text = "Hide Solution" if show_solution else "Auto Solve"
+    mark_dirty()
 
 def reset_game():
-    global user_pairs, selected_cells, show_solution
+    global user_pairs, selected_cells, show_solution, solution_pairs, pairs_version, active_animations
     user_pairs = []
+    pairs_version += 1
     selected_cells = []
     show_solution = False
-    animation_progress.clear()
+    solution_pairs = []
+    active_animations = 0
+    line_layers.clear()
     buttons[0].text = "Auto Solve"
+    mark_dirty()
 
 def toggle_help():
     global show_help
     show_help = not show_help
+    mark_dirty()
 
 # Functions to draw UI elements
-def draw_cell(i, j, highlight=False):
-    # Cell position and dimensions
-    x = j * (CELL_SIZE + MARGIN) + MARGIN
-    y = i * (CELL_SIZE + MARGIN) + MARGIN
-    rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
+def render_cell_surface(color_idx, value):
+    """Render a cell (background, shadow and value) once on its own surface."""
+    # The shadow lines overflow the cell into its right and bottom margins, which are
+    # included in the (opaque) surface: cell surfaces tile the grid without overlapping
+    surface = new_surface(CELL_SIZE + MARGIN, CELL_SIZE + MARGIN, alpha=False)
+    surface.fill(BACKGROUND)
+    rect = pygame.Rect(0, 0, CELL_SIZE, CELL_SIZE)
     
     # Base cell color
-    color = COLOR_MAP[grid.color[i][j]]
+    color = COLOR_MAP[color_idx]
     
-    # Draw cell with slightly rounded corners
-    draw_rounded_rect(screen, rect, color, 4)
+    # Draw cell with slightly rounded corners (directly, the surface is rendered only once)
+    draw_rounded_rect_primitives(surface, rect, color, 4)
     
     # Add depth/shadow effect
-    if grid.color[i][j] != 4:  # No shadow for black cells
+    if color_idx != 4:  # No shadow for black cells
         pygame.draw.line(
-            screen,
+            surface,
             (color[0] * 0.8, color[1] * 0.8, color[2] * 0.8),
-            (x, y + CELL_SIZE),
-            (x + CELL_SIZE, y + CELL_SIZE),
+            (0, CELL_SIZE),
+            (CELL_SIZE, CELL_SIZE),
             2
         )
         pygame.draw.line(
-            screen,
+            surface,
             (color[0] * 0.8, color[1] * 0.8, color[2] * 0.8),
-            (x + CELL_SIZE, y),
-            (x + CELL_SIZE, y + CELL_SIZE),
+            (CELL_SIZE, 0),
+            (CELL_SIZE, CELL_SIZE),
             2
         )
     
+    # Display value
+    if color_idx != 4:
+        text_color = (255, 255, 255) if color_idx in [2, 4] else (0, 0, 0)
+        text = FONT.render(str(value), True, text_color)
+        text_rect = text.get_rect(center=rect.center)
+        surface.blit(text, text_rect)
+    
+    return surface
+
+def build_cell_surfaces():
+    """
+    Pre-render every distinct (color, value) cell once, since cells never change after
+    the grid is loaded, and compute the (surface, position) list blitted each frame.
+    """
+    cell_surfaces = {}
+    cell_blits = []
+    for i in range(grid.n):
+        for j in range(grid.m):
+            key = (int(grid.color[i, j]), int(grid.value[i, j]))
+            if key not in cell_surfaces:
+                cell_surfaces[key] = render_cell_surface(*key)
+            cell_blits.append((cell_surfaces[key], (COL_PIX[j], ROW_PIX[i])))
+    return cell_surfaces, cell_blits
+
+def draw_static():
+    """
+    Render the parts of the window that never change (background, cells and sidebar
+    background) once on a surface, blitted at the start of each frame.
+    The grid dimensions and the cell positions are fixed once the grid is loaded, so the
+    cells are drawn with a single blits call over the precomputed CELL_BLITS, and no code
+    run on each frame loops over the grid.
+    """
+    surface = new_surface(WIDTH, HEIGHT, alpha=False)
+    surface.fill(BACKGROUND)
+    surface.blits(CELL_BLITS, doreturn=False)
+    pygame.draw.rect(surface, (40, 40, 50), SIDEBAR_RECT)
+    pygame.draw.line(surface, GRID_LINES, (SIDEBAR_RECT.x, 0), (SIDEBAR_RECT.x, HEIGHT), 2)
+    return surface
+
+def draw_cell(i, j, highlight=False):
+    # Cell position and dimensions
+    x = COL_PIX[j]
+    y = ROW_PIX[i]
+    
+    # Pre-rendered cell
+    screen.blit(CELL_SURFACE_CACHE[(int(grid.color[i, j]), int(grid.value[i, j]))], (x, y))
+    
     # Highlight cell if needed
     if highlight:
-        highlight_rect = rect.inflate(-4, -4)
+        highlight_rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE).inflate(-4, -4)
         pygame.draw.rect(screen, HIGHLIGHT_COLOR, highlight_rect, 3, border_radius=3)
-    
-    # Display value
-    if not grid.is_forbidden(i, j):
-        text_color = (255, 255, 255) if grid.color[i][j] in [2, 4] else (0, 0, 0)
-        text = FONT.render(str(grid.value[i][j]), True, text_color)
-        text_rect = text.get_rect(center=rect.center)
-        screen.blit(text, text_rect)
 
-def draw_pair_line(cell1, cell2, progress=1.0, color=LINE_COLOR, width=3):
+def draw_pair_line(surface, cell1, cell2, progress=1.0, color=LINE_COLOR, width=3):
     x1, y1 = cell1
     x2, y2 = cell2
     
     # Center positions of cells
-    start_x = y1 * (CELL_SIZE + MARGIN) + CELL_SIZE // 2 + MARGIN
-    start_y = x1 * (CELL_SIZE + MARGIN) + CELL_SIZE // 2 + MARGIN
-    end_x = y2 * (CELL_SIZE + MARGIN) + CELL_SIZE // 2 + MARGIN
-    end_y = x2 * (CELL_SIZE + MARGIN) + CELL_SIZE // 2 + MARGIN
+    start_x = COL_CENTER[y1]
+    start_y = ROW_CENTER[x1]
+    end_x = COL_CENTER[y2]
+    end_y = ROW_CENTER[x2]
     
     # If animation is in progress, compute current end position
     if progress < 1.0:
@@ -268,75 +390,86 @@ def draw_pair_line(cell1, cell2, progress=1.0, color=LINE_COLOR, width=3):
         current_y = start_y + (end_y - start_y) * progress
         end_x, end_y = current_x, current_y
     
-    # Draw anti-aliased line
-    gfxdraw.line(screen, int(start_x), int(start_y), int(end_x), int(end_y), color)
-    
-    # Thicken the line by drawing several lines
-    for i in range(1, width):
-        offset = i // 2
-        if i % 2 == 0:
-            gfxdraw.line(
-                screen,
-                int(start_x + offset),
-                int(start_y),
-                int(end_x + offset),
-                int(end_y),
-                color
-            )
-        else:
-            gfxdraw.line(
-                screen,
-                int(start_x),
-                int(start_y + offset),
-                int(end_x),
-                int(end_y + offset),
-                color
-            )
+    # Draw the line in a single call, antialiased when it is thin enough
+    if width <= 2:
+        pygame.draw.aaline(surface, color, (start_x, start_y), (end_x, end_y))
+    else:
+        pygame.draw.line(surface, color, (start_x, start_y), (end_x, end_y), width)
+
+def draw_pair_lines(group, pairs, speed, color, width):
+    """
+    Draw the lines of a group of pair records ("user" or "solution"), advancing their animation.
+    The lines whose animation is over are drawn all at once from a layer, which is only
+    rendered again when the finished pairs change. When no animation is running, the
+    pairs are not even looked at.
+    """
+    global active_animations
+    
+    # Update animations
+    if active_animations:
+        for pair in pairs:
+            if pair["progress"] < 1.0:
+                pair["progress"] = min(1.0, pair["progress"] + speed)
+                if pair["progress"] == 1.0:
+                    active_animations -= 1
+                    line_layers.pop(group, None)
+    
+    # Finished lines
+    if group not in line_layers:
+        surface = new_surface(*GRID_RECT.size)
+        surface.fill((*color[:3], 0))
+        for pair in pairs:
+            if pair["progress"] == 1.0:
+                # Lines are drawn opaque on the screen, so they must be opaque on the layer too
+                draw_pair_line(surface, *pair["cells"], 1.0, color[:3], width)
+        line_layers[group] = surface
+    screen.blit(line_layers[group], GRID_RECT)
+    
+    # Lines being animated
+    if active_animations:
+        for pair in pairs:
+            if pair["progress"] < 1.0:
+                draw_pair_line(screen, *pair["cells"], pair["progress"], color, width)
 
 def draw_sidebar():
-    # Sidebar background
-    sidebar_rect = pygame.Rect(grid.m * (CELL_SIZE + MARGIN) + MARGIN, 0, SIDEBAR_WIDTH, HEIGHT)
-    pygame.draw.rect(screen, (40, 40, 50), sidebar_rect)
-    pygame.draw.line(screen, GRID_LINES, (sidebar_rect.x, 0), (sidebar_rect.x, HEIGHT), 2)
+    # The sidebar background is part of the static surface
+    sidebar_rect = SIDEBAR_RECT
     
     # Draw buttons
     for button in buttons:
         button.draw()
     
     # Display score with animation
-    score_text = FONT_LARGE.render(f"Score: {int(score_animation['current'])}", True, TEXT_COLOR)
+    score_text = render_cached(FONT_LARGE, f"Score: {int(score_animation['current'])}", TEXT_COLOR)
     score_rect = score_text.get_rect(topleft=(sidebar_rect.x + 20, HEIGHT - 140))
     screen.blit(score_text, score_rect)
     
     # Display best possible score if available
     if best_score is not None:
-        best_score_text = FONT.render(f"Best score: {best_score}", True, (150, 255, 150))
+        best_score_text = render_cached(FONT, f"Best score: {best_score}", (150, 255, 150))
         best_score_rect = best_score_text.get_rect(topleft=(sidebar_rect.x + 20, HEIGHT - 110))
         screen.blit(best_score_text, best_score_rect)
     
     # Display grid info
-    grid_info = FONT_SMALL.render(f"Grid: {grid.n}×{grid.m}", True, TEXT_COLOR)
+    grid_info = render_cached(FONT_SMALL, f"Grid: {grid.n}×{grid.m}", TEXT_COLOR)
     screen.blit(grid_info, (sidebar_rect.x + 20, HEIGHT - 60))
 
-def draw_help_overlay():
-    if not show_help:
-        return
-    
+def render_help_overlay():
+    """Render the help overlay once on a transparent surface, since its content never changes."""
     # Semi-transparent background
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    overlay = new_surface(WIDTH, HEIGHT)
     overlay.fill((0, 0, 0, 180))
-    screen.blit(overlay, (0, 0))
     
     # Help box
     help_width = 500
     help_height = 300
     help_rect = pygame.Rect((WIDTH - help_width) // 2, (HEIGHT - help_height) // 2, help_width, help_height)
-    draw_rounded_rect(screen, help_rect, (50, 50, 60), 10)
+    draw_rounded_rect(overlay, help_rect, (50, 50, 60), 10)
     
     # Title
-    title = FONT_LARGE.render("How to play", True, TEXT_COLOR)
+    title = render_cached(FONT_LARGE, "How to play", TEXT_COLOR)
     title_rect = title.get_rect(midtop=(help_rect.centerx, help_rect.y + 20))
-    screen.blit(title, title_rect)
+    overlay.blit(title, title_rect)
     
     # Instructions
     instructions = [
@@ -350,40 +483,63 @@ def draw_help_overlay():
     ]
     
     for i, line in enumerate(instructions):
-        text = FONT.render(line, True, TEXT_COLOR)
-        screen.blit(text, (help_rect.x + 30, help_rect.y + 70 + i * 30))
+        text = render_cached(FONT, line, TEXT_COLOR)
+        overlay.blit(text, (help_rect.x + 30, help_rect.y + 70 + i * 30))
     
     # Close hint
-    close_text = FONT.render("Click anywhere to close", True, (180, 180, 180))
+    close_text = render_cached(FONT, "Click anywhere to close", (180, 180, 180))
     close_rect = close_text.get_rect(midbottom=(help_rect.centerx, help_rect.bottom - 20))
-    screen.blit(close_text, close_rect)
+    overlay.blit(close_text, close_rect)
+    
+    return overlay
+
+def draw_help_overlay():
+    if show_help:
+        screen.blit(HELP_OVERLAY_SURF, (0, 0))
+
+# Paired cells, in row-major order (reused by each score computation)
+paired_mask = np.zeros(grid.n * grid.m, dtype=bool)
 
 def calculate_score(pairs):
-    """Compute the total score."""
-    score = 0
-    
+    """Compute the total score of a list of pair records, with NumPy masks over the whole grid."""
     # Add cost of pairs
-    if pairs:
-        score += sum(grid.cost(pair) for pair in pairs)
-    
-    # Find already paired cells
-    paired_cells = {cell for pair in pairs for cell in pair} if pairs else set()
+    score = sum(pair["cost"] for pair in pairs)
     
     # Add value of unpaired cells
-    for i in range(grid.n):
-        for j in range(grid.m):
-            if (i, j) not in paired_cells and not grid.is_forbidden(i, j):
-                score += grid.value[i][j]
+    i1, j1, i2, j2 = np.array([pair["cells"] for pair in pairs], dtype=np.intp).reshape(-1, 4).T
+    paired_mask.fill(False)
+    paired_mask[i1 * grid.m + j1] = True
+    paired_mask[i2 * grid.m + j2] = True
+    score += int(grid.value.ravel()[~paired_mask & ~grid.forbidden_mask.ravel()].sum())
     
     return score
 
 def draw_grid():
-    global last_score, hovering_cell
-    
+    global needs_redraw
+    
+    # Restore the static background, then draw the rest on top
+    animating = animation_in_progress()
+    screen.blit(STATIC_SURFACE, (0, 0))
+    draw_dynamic()
+    
+    # Lines and score change on every frame of an animation (including the frames
+    # on which it starts or ends)
+    if animating or animation_in_progress():
+        dirty_rects.append(GRID_RECT)
+        dirty_rects.append(SIDEBAR_RECT)
+    
+    # Update the changed parts of the display
+    pygame.display.update(dirty_rects)
+    dirty_rects.clear()
+    needs_redraw = False
+
+def draw_dynamic():
     # Update score animation
-    target_score = calculate_score(user_pairs)
-    if target_score != score_animation["target"]:
-        score_animation["target"] = target_score
+    # (the score is only recomputed when the pairs changed)
+    if score_cache["version"] != pairs_version:
+        score_cache["version"] = pairs_version
+        score_cache["value"] = calculate_score(user_pairs)
+    score_animation["target"] = score_cache["value"]
     
     # Smooth score animation
     score_diff = score_animation["target"] - score_animation["current"]
@@ -392,52 +548,24 @@ def draw_grid():
     else:
         score_animation["current"] = score_animation["target"]
     
-    # Draw background
-    screen.fill(BACKGROUND)
-    
-    # Draw each cell
-    for i in range(grid.n):
-        for j in range(grid.m):
-            # Determine if cell is selected or hovered
-            is_selected = (i, j) in selected_cells
-            is_hovered = hovering_cell == (i, j)
-            draw_cell(i, j, highlight=is_selected or is_hovered)
+    # Draw the selected and hovered cells with a highlight
+    for (i, j) in selected_cells:
+        draw_cell(i, j, highlight=True)
+    if hovering_cell is not None and hovering_cell not in selected_cells:
+        draw_cell(*hovering_cell, highlight=True)
     
     # Draw user pairs with animation
-    for idx, (cell1, cell2) in enumerate(user_pairs):
-        pair_key = f"user_{idx}"
-        if pair_key not in animation_progress:
-            animation_progress[pair_key] = 0.0
-        
-        # Update animation
-        if animation_progress[pair_key] < 1.0:
-            animation_progress[pair_key] += 0.05
-        
-        # Draw line
-        draw_pair_line(cell1, cell2, animation_progress[pair_key], LINE_COLOR, width=4)
+    draw_pair_lines("user", user_pairs, 0.05, LINE_COLOR, 4)
     
-    # Draw solution if requested
+    # Draw solution if requested, with a slower animation
     if show_solution:
-        for idx, (cell1, cell2) in enumerate(solution_pairs):
-            pair_key = f"solution_{idx}"
-            if pair_key not in animation_progress:
-                animation_progress[pair_key] = 0.0
-            
-            # Update animation with a slight delay for each pair
-            if animation_progress[pair_key] < 1.0:
-                animation_progress[pair_key] += 0.03
-            
-            # Draw solution line
-            draw_pair_line(cell1, cell2, animation_progress[pair_key], (100, 200, 100, 180), width=2)
+        draw_pair_lines("solution", solution_pairs, 0.03, (100, 200, 100, 180), 2)
     
     # Draw sidebar
     draw_sidebar()
     
     # Draw help if needed
     draw_help_overlay()
-    
-    # Update display
-    pygame.display.flip()
 
 def handle_cell_click(pos):
     # Convert mouse position to cell coordinates
@@ -448,28 +576,18 @@ def handle_cell_click(pos):
     if i >= grid.n or j >= grid.m or grid.is_forbidden(i, j):
         return
     
-    global selected_cells, user_pairs
+    global selected_cells, user_pairs, pairs_version, active_animations
+    mark_dirty(GRID_RECT)
     
     # Check if we clicked on an existing pair
-    for pair_idx, (c1, c2) in enumerate(user_pairs):
-        if (i, j) in [c1, c2]:
-            # Remove the pair
-            user_pairs.pop(pair_idx)
-            # Remove corresponding animation
-            animation_progress.pop(f"user_{pair_idx}", None)
-            # Reindex remaining animations
-            new_animation_progress = {}
-            for k, v in animation_progress.items():
-                if k.startswith("user_"):
-                    idx = int(k.split("_")[1])
-                    if idx > pair_idx:
-                        new_animation_progress[f"user_{idx-1}"] = v
-                    else:
-                        new_animation_progress[k] = v
-                else:
-                    new_animation_progress[k] = v
-            animation_progress.clear()
-            animation_progress.update(new_animation_progress)
+    for pair_idx, pair in enumerate(user_pairs):
+        if (i, j) in pair["cells"]:
+            # Remove the pair, along with its animation
+            if user_pairs.pop(pair_idx)["progress"] < 1.0:
+                active_animations -= 1
+            else:
+                line_layers.pop("user", None)
+            pairs_version += 1
             return
     
     # Handle selection
@@ -483,35 +601,61 @@ def handle_cell_click(pos):
             # Use test_pair to check if the pair is valid
             if grid.test_pair(c1, c2) and c1 != c2:
                 # Check that cells are not already paired
-                if all(c1 not in pair and c2 not in pair for pair in user_pairs):
-                    user_pairs.append((c1, c2))
+                if all(c1 not in pair["cells"] and c2 not in pair["cells"] for pair in user_pairs):
+                    user_pairs.append(new_pair(c1, c2))
+                    active_animations += 1
+                    pairs_version += 1
             selected_cells.clear()
 
 def handle_mouse_motion(pos):
-    global hovering_cell
+    global hovering_cell, mouse_cell, hovered_button
     
     # Check if mouse is over the grid
-    grid_width = grid.m * (CELL_SIZE + MARGIN) + MARGIN
-    if pos[0] <= grid_width:
+    if pos[0] <= GRID_RECT.width:
         # Convert position to cell coordinates
-        j = pos[0] // (CELL_SIZE + MARGIN)
-        i = pos[1] // (CELL_SIZE + MARGIN)
-        
+        cell = (pos[1] // (CELL_SIZE + MARGIN), pos[0] // (CELL_SIZE + MARGIN))
+    else:
+        cell = None
+    
+    # The hovered cell can only change when the mouse crosses a cell boundary
+    if cell != mouse_cell:
+        mouse_cell = cell
+        previous_cell = hovering_cell
+    
         # Update hovered cell
-        if 0 <= i < grid.n and 0 <= j < grid.m and not grid.is_forbidden(i, j):
-            hovering_cell = (i, j)
+        if cell is not None and cell[0] < grid.n and cell[1] < grid.m and not grid.is_forbidden(*cell):
+            hovering_cell = cell
         else:
             hovering_cell = None
-    else:
-        hovering_cell = None
     
-    # Update button hover state
-    for button in buttons:
-        button.check_hover(pos)
+        # Only the previously and newly hovered cells need to be redrawn
+        if hovering_cell != previous_cell:
+            for cell in (previous_cell, hovering_cell):
+                if cell is not None:
+                    mark_dirty(cell_rect(*cell))
+    
+    # Update button hover state, unless the mouse is still over the hovered button
+    if hovered_button is not None and buttons[hovered_button].rect.collidepoint(pos):
+        return
+    button_idx = None
+    for idx, button in enumerate(buttons):
+        if button.rect.collidepoint(pos):
+            button_idx = idx
+            break
+    if button_idx != hovered_button:
+        for idx in (hovered_button, button_idx):
+            if idx is not None:
+                buttons[idx].check_hover(pos)
+        hovered_button = button_idx
 
 # Create buttons
 buttons = create_buttons()
 
+# Pre-render cells and the static background
+CELL_SURFACE_CACHE, CELL_BLITS = build_cell_surfaces()
+STATIC_SURFACE = draw_static()
+HELP_OVERLAY_SURF = render_help_overlay()
+
 # Main loop
 def main():
     global running
@@ -523,15 +667,22 @@ def main():
     show_help = True
     
     while running:
+        # While something is animated, frames are paced by the clock; otherwise the
+        # loop sleeps until an event arrives
+        if animation_in_progress():
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait(IDLE_TIMEOUT)] + pygame.event.get()
+        
         # Handle events
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 # If help is displayed, close it on click
                 if show_help:
-                    show_help = False
+                    toggle_help()
                     continue
                 
                 # Check if a button was clicked
@@ -547,6 +698,10 @@ def main():
             elif event.type == pygame.MOUSEMOTION:
                 handle_mouse_motion(pygame.mouse.get_pos())
             
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                # The window content may have been lost: repaint it all
+                mark_dirty()
+            
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     auto_solve()
@@ -557,11 +712,12 @@ def main():
                 elif event.key == pygame.K_ESCAPE:
                     running = False
         
-        # Draw UI
-        draw_grid()
-        
-        # Limit framerate
-        clock.tick(60)
+        # Draw UI, only when something changed
+        if needs_redraw or animation_in_progress():
+            draw_grid()
+            
+            # Limit framerate
+            clock.tick(60)
 
     pygame.quit()
     sys.exit()
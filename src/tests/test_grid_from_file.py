@@ -1,6 +1,10 @@
 import os
 import sys
+import tempfile
 import unittest
+import warnings
+
+import numpy as np
 
 CURRENT_DIR = os.path.dirname(__file__)
 SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
@@ -16,22 +20,41 @@ class Test_GridLoading(unittest.TestCase):
         grid = Grid.grid_from_file("input/grid00.in",read_values=True)
         self.assertEqual(grid.n, 2)
         self.assertEqual(grid.m, 3)
-        self.assertEqual(grid.color, [[0, 0, 0], [0, 0, 0]])
-        self.assertEqual(grid.value, [[5, 8, 4], [11, 1, 3]])
+        self.assertEqual(grid.color.tolist(), [[0, 0, 0], [0, 0, 0]])
+        self.assertEqual(grid.value.tolist(), [[5, 8, 4], [11, 1, 3]])
 
     def test_grid0_novalues(self):
         grid = Grid.grid_from_file("input/grid00.in",read_values=False)
         self.assertEqual(grid.n, 2)
         self.assertEqual(grid.m, 3)
-        self.assertEqual(grid.color, [[0, 0, 0], [0, 0, 0]])
-        self.assertEqual(grid.value, [[1, 1, 1], [1, 1, 1]])
+        self.assertEqual(grid.color.tolist(), [[0, 0, 0], [0, 0, 0]])
+        self.assertEqual(grid.value.tolist(), [[1, 1, 1], [1, 1, 1]])
 
     def test_grid1(self):
         grid = Grid.grid_from_file("input/grid01.in",read_values=True)
         self.assertEqual(grid.n, 2)
         self.assertEqual(grid.m, 3)
-        self.assertEqual(grid.color, [[0, 4, 3], [2, 1, 0]])
-        self.assertEqual(grid.value, [[5, 8, 4], [11, 1, 3]])
+        self.assertEqual(grid.color.tolist(), [[0, 4, 3], [2, 1, 0]])
+        self.assertEqual(grid.value.tolist(), [[5, 8, 4], [11, 1, 3]])
+
+    def test_grid_missing_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, "grid.in")
+            with open(file_name, "w") as file:
+                file.write("2 3\n0 0 0\n0 0 0\n")
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                with self.assertRaisesRegex(Exception, "Invalid format"):
+                    Grid.grid_from_file(file_name, read_values=True)
+                grid = Grid.grid_from_file(file_name, read_values=False)
+        self.assertEqual(grid.value.tolist(), [[1, 1, 1], [1, 1, 1]])
+
+    def test_grid_storage(self):
+        grid = Grid.grid_from_file("input/grid01.in",read_values=True)
+        self.assertEqual(grid.color.shape, (2, 3))
+        self.assertEqual(grid.color.dtype, np.uint8)
+        self.assertEqual(grid.value.dtype, np.int32)
+        self.assertEqual(grid.forbidden_mask.tolist(), (grid.color == 4).tolist())
 
 if __name__ == '__main__':
     unittest.main()
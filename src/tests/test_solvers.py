@@ -0,0 +1,112 @@
+import os
+import sys
+import unittest
+import importlib.util
+
+CURRENT_DIR = os.path.dirname(__file__)
+SRC_DIR = os.path.abspath(os.path.join(CURRENT_DIR, ".."))
+sys.path.append(SRC_DIR)
+
+from gridpairing import Grid, SolverNaive, SolverBellmanFord, SolverMatching
+from gridpairing.solvers import Graph
+
+
+# Testing the solvers and the min-cost flow graph
+
+
+class TestGraph(unittest.TestCase):
+
+    def test_min_cost_flow(self):
+        # 0 = source, 3 = sink, two disjoint paths of cost 1 and 5
+        graph = Graph(4)
+        graph.add_edge(0, 1, 1, 0)
+        graph.add_edge(0, 2, 1, 0)
+        graph.add_edge(1, 3, 1, 1)
+        graph.add_edge(2, 3, 1, 5)
+        total_cost, _ = graph.min_cost_flow(0, 3)
+        self.assertEqual(total_cost, 6)
+        self.assertEqual(graph.flow[:graph.n_edges:2].tolist(), [1, 1, 1, 1])
+        self.assertEqual(graph.reverse_residual.tolist(), [0, 1, 1, 2])
+
+
+class TestSolvers(unittest.TestCase):
+
+    def check_pairs(self, grid, pairs):
+        used_cells = set()
+        for (c1, c2) in pairs:
+            self.assertTrue(grid.test_pair(c1, c2), f"Pair {c1}-{c2} should be valid")
+            self.assertNotIn(c1, used_cells)
+            self.assertNotIn(c2, used_cells)
+            used_cells.update((c1, c2))
+
+    def test_grid0(self):
+        grid = Grid.grid_from_file("input/grid00.in", read_values=True)
+        self.assertEqual(SolverNaive(grid).run(), 14)
+        self.assertEqual(SolverBellmanFord(grid).run(), 12)
+
+    def test_run_twice(self):
+        grid = Grid.grid_from_file("input/grid12.in", read_values=True)
+        BF_solver = SolverBellmanFord(grid)
+        score = BF_solver.run()
+        pairs = BF_solver.pairs
+        n_edges = BF_solver.graph.n_edges
+        self.assertEqual(BF_solver.run(), score)
+        self.assertEqual(BF_solver.pairs, pairs)
+        self.assertEqual(BF_solver.graph.n_edges, n_edges)
+
+    def test_no_valid_pair(self):
+        grid = Grid(2, 2, [[1, 3], [3, 4]], [[2, 5], [7, 1]])
+        BF_solver = SolverBellmanFord(grid)
+        self.assertEqual(BF_solver.run(), 14)
+        self.assertEqual(BF_solver.pairs, [])
+
+    def test_solutions(self):
+        for grid_number in ["01", "02", "03", "04", "05", "12", "15"]:
+            grid = Grid.grid_from_file("input/grid" + grid_number + ".in", read_values=True)
+            naive_solver = SolverNaive(grid)
+            naive_score = naive_solver.run()
+            BF_solver = SolverBellmanFord(grid)
+            BF_score = BF_solver.run()
+            self.check_pairs(grid, naive_solver.pairs)
+            self.check_pairs(grid, BF_solver.pairs)
+            self.assertEqual(naive_score, naive_solver.score())
+            self.assertEqual(BF_score, BF_solver.score())
+            self.assertLessEqual(BF_score, naive_score)
+
+    @unittest.skipIf(importlib.util.find_spec("numba") is None, "numba is not installed")
+    def test_large_grid_scores(self):
+        # Several sets of pairs are optimal for the min-cost flow, and the order in which
+        # Bellman-Ford scans the nodes decides which one is found: pins the resulting scores
+        for grid_number, expected in [("17", 256), ("27", 25077), ("28", 24571)]:
+            grid = Grid.grid_from_file("input/grid" + grid_number + ".in", read_values=True)
+            self.assertEqual(SolverBellmanFord(grid).run(), expected)
+
+    @unittest.skipIf(importlib.util.find_spec("scipy") is None, "scipy is not installed")
+    def test_matching_solver(self):
+        for grid_number in ["00", "05", "17", "19"]:
+            grid = Grid.grid_from_file("input/grid" + grid_number + ".in", read_values=True)
+            BF_solver = SolverBellmanFord(grid)
+            BF_solver.run()
+            matching_solver = SolverMatching(grid)
+            matching_solver.run()
+            self.check_pairs(grid, matching_solver.pairs)
+            # Same number of pairs and same total cost as the min-cost flow
+            self.assertEqual(len(matching_solver.pairs), len(BF_solver.pairs))
+            self.assertEqual(sum(grid.cost(pair) for pair in matching_solver.pairs),
+                             sum(grid.cost(pair) for pair in BF_solver.pairs))
+
+    @unittest.skipIf(importlib.util.find_spec("scipy") is None, "scipy is not installed")
+    def test_matching_solver_ties(self):
+        # Pairing the first two cells or the last two costs 1 either way, but leaves
+        # a cell of value 7 or 5 unpaired: the solvers may break this tie differently
+        grid = Grid(3, 1, [[0], [1], [2]], [[5], [6], [7]])
+        for solver in [SolverBellmanFord(grid), SolverMatching(grid)]:
+            score = solver.run()
+            self.check_pairs(grid, solver.pairs)
+            self.assertEqual(len(solver.pairs), 1)
+            self.assertEqual(grid.cost(solver.pairs[0]), 1)
+            self.assertIn(score, [6, 8])
+            self.assertEqual(score, solver.score())
+
+if __name__ == "__main__":
+    unittest.main()
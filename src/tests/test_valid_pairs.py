@@ -31,5 +31,53 @@ class TestValidPairs(unittest.TestCase):
             self.assertNotIn(pair[0], black_cells)
             self.assertNotIn(pair[1], black_cells)
 
+    def test_pairs_are_unique(self):
+        for grid_number in ["01", "05", "15", "23"]:
+            grid = Grid.grid_from_file("input/grid" + grid_number + ".in", read_values=True)
+            pairs = grid.all_pairs()
+            self.assertEqual(len(pairs), len(set(pairs)))
+            self.assertEqual(len(pairs), len({(c2, c1) for (c1, c2) in pairs} | set(pairs)) // 2)
+
+    def test_all_valid_pairs_found(self):
+        grid = Grid.grid_from_file("input/grid15.in", read_values=True)
+        expected = set()
+        for i in range(grid.n):
+            for j in range(grid.m):
+                for c2 in [(i, j + 1), (i + 1, j)]:
+                    if c2[0] < grid.n and c2[1] < grid.m and grid.test_pair((i, j), c2):
+                        expected.add(((i, j), c2))
+        pairs = grid.all_pairs()
+        self.assertEqual(len(pairs), len(expected))
+        self.assertEqual(set(pairs), expected)
+
+    def test_kernel_matches_numpy_masks(self):
+        from gridpairing import grid as grid_module
+        for grid_number in ["01", "05", "15", "23"]:
+            grid = Grid.grid_from_file("input/grid" + grid_number + ".in", read_values=True)
+            expected = grid_module._enumerate_valid_pairs(grid.color, grid_module._COMPAT, grid.n, grid.m)
+            has_numba = grid_module._HAS_NUMBA
+            grid_module._HAS_NUMBA = False
+            try:
+                self.assertEqual(grid.all_pairs_array().tolist(), expected.tolist())
+            finally:
+                grid_module._HAS_NUMBA = has_numba
+
+    def test_non_adjacent_pairs(self):
+        grid = Grid(3, 3)
+        self.assertTrue(grid.test_pair((1, 1), (1, 2)))
+        self.assertTrue(grid.test_pair((1, 1), (0, 1)))
+        self.assertFalse(grid.test_pair((1, 1), (1, 1)))
+        self.assertFalse(grid.test_pair((0, 0), (1, 1)))
+        self.assertFalse(grid.test_pair((0, 0), (0, 2)))
+
+    def test_color_rules(self):
+        allowed = {0: {0, 1, 2, 3}, 1: {0, 1, 2}, 2: {0, 1, 2}, 3: {0, 3}, 4: set()}
+        for c1 in range(5):
+            for c2 in range(5):
+                grid = Grid(1, 2, [[c1, c2]])
+                self.assertEqual(grid.colors_forbidden((0, 0), (0, 1)), c2 not in allowed[c1])
+                self.assertEqual(grid.test_pair((0, 0), (0, 1)), c2 in allowed[c1])
+                self.assertEqual(len(grid.all_pairs()), int(c2 in allowed[c1]))
+
 if __name__ == "__main__":
     unittest.main()